@@ -1,8 +1,16 @@
+from pathlib import Path
+
+import numpy as np
 import polars as pl
-import matplotlib.pyplot as plt
-import seaborn as sns
-import geopandas as gpd
-from pyfonts import load_font
+import matplotlib
+
+# Render straight to files, no GUI backend needed
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+from matplotlib.colors import Normalize  # noqa: E402
+import seaborn as sns  # noqa: E402
+import geopandas as gpd  # noqa: E402
 
 # =============================================================================
 # Story
@@ -20,18 +28,24 @@ from pyfonts import load_font
 #
 # =============================================================================
 
-# Load data
-df = pl.read_csv(
-    "https://raw.githubusercontent.com/rfordatascience/tidytuesday/main/data/2026/2026-01-13/africa.csv"
-)
 
-# Load fonts
-font_regular = load_font(
-    "https://github.com/google/fonts/raw/main/ofl/spacegrotesk/SpaceGrotesk%5Bwght%5D.ttf"
-)
-font_bold = load_font(
-    "https://github.com/google/fonts/raw/main/ofl/spacemono/SpaceMono-Bold.ttf"
-)
+def scan_cached_csv(url, cache_path):
+    """Download a remote CSV once as Parquet and scan the local copy afterwards."""
+    cache_path = Path(cache_path)
+    if not cache_path.exists():
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        pl.read_csv(url).write_parquet(cache_path)
+    return pl.scan_parquet(cache_path)
+
+
+def read_cached_shapefile(shp_path, cache_path, columns=None):
+    """Convert a shapefile to GeoParquet once and read the local copy afterwards."""
+    cache_path = Path(cache_path)
+    if not cache_path.exists():
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        gpd.read_file(shp_path).to_parquet(cache_path)
+    return gpd.read_parquet(cache_path, columns=columns)
+
 
 # print(df.head())
 # print(len(df))
@@ -65,147 +79,197 @@ font_bold = load_font(
 # print("Top Cross-Border Languages:\n", multi_nation)
 
 
-# Speaker Density per Family
-# Density = Total Native Speakers / Number of Unique Languages in that family
-density_df = (
-    df.group_by("family")
-    .agg(
-        [
-            pl.col("native_speakers").sum().alias("total_speakers"),
-            pl.col("language").n_unique().alias("unique_languages_count"),
-        ]
+def build_tables(lf):
+    """Aggregate the language table into the four tables plotted below."""
+    # Speaker Density per Family
+    # Density = Total Native Speakers / Number of Unique Languages in that family
+    density_df = (
+        lf.group_by("family")
+        .agg(
+            [
+                pl.col("native_speakers").sum().alias("total_speakers"),
+                pl.col("language").n_unique().alias("unique_languages_count"),
+            ]
+        )
+        .with_columns(
+            (pl.col("total_speakers") / pl.col("unique_languages_count")).alias(
+                "speaker_density"
+            )
+        )
+        .sort("speaker_density", descending=True)
+    )
+
+    # Cross-border Reach
+    # Which languages unite the most countries?
+    reach_df = (
+        lf.group_by("language")
+        .agg(pl.col("country").n_unique().alias("country_count"))
+        .filter(pl.col("country_count") > 1)
+        .sort("country_count", descending=True)
+    )
+
+    # Linguistic Concentration (Entropy-like)
+    # How concentrated are speakers within a country?
+    country_concentration = (
+        lf.group_by("country")
+        .agg(
+            [
+                pl.col("language").count().alias("lang_count"),
+                pl.col("native_speakers").std().fill_null(0).alias("speaker_variance"),
+            ]
+        )
+        .sort("lang_count", descending=True)
     )
-    .with_columns(
-        (pl.col("total_speakers") / pl.col("unique_languages_count")).alias(
-            "speaker_density"
+
+    # Diversity of Language Families per Country
+    # We want to know how many distinct 'branches' of humanity are in one place.
+    country_diversity = (
+        lf.group_by("country")
+        .agg(
+            [
+                pl.col("family").n_unique().alias("family_diversity"),
+                pl.col("language").count().alias("total_languages"),
+            ]
         )
+        .sort("family_diversity", descending=True)
     )
-    .sort("speaker_density", descending=True)
-)
-
-# Cross-border Reach
-# Which languages unite the most countries?
-reach_df = (
-    df.group_by("language")
-    .agg(pl.col("country").n_unique().alias("country_count"))
-    .filter(pl.col("country_count") > 1)
-    .sort("country_count", descending=True)
-)
-
-# Linguistic Concentration (Entropy-like)
-# How concentrated are speakers within a country?
-country_concentration = (
-    df.group_by("country")
-    .agg(
-        [
-            pl.col("language").count().alias("lang_count"),
-            pl.col("native_speakers").std().fill_null(0).alias("speaker_variance"),
-        ]
+
+    return pl.collect_all(
+        [density_df, reach_df, country_concentration, country_diversity]
     )
-    .sort("lang_count", descending=True)
-)
+
 
 # --- Visualizations ---
 
-# Plot 1: Speaker Density per Family
-plt.figure(figsize=(12, 6))
-sns.barplot(
-    data=density_df.to_pandas(),
-    x="speaker_density",
-    hue="speaker_density",
-    y="family",
-    palette="flare",
-)
-plt.title(
-    "Speaker Density: Which Language Families have the most 'Impact' per Language?",
-    fontsize=14,
-)
-plt.xlabel("Average Native Speakers per Language")
-plt.ylabel("Language Family")
-plt.tight_layout()
-plt.savefig("src/2026/20260113/speaker_density.png")
-
-# Plot 2: Cross-border Reach
-plt.figure(figsize=(12, 6))
-sns.barplot(
-    data=reach_df.to_pandas().head(10),
-    x="country_count",
-    hue="country_count",
-    y="language",
-    palette="crest",
-)
-plt.title(
-    "Bridges of the Continent: Top 10 Languages Spoken in Multiple Countries",
-    fontsize=14,
-)
-plt.xlabel("Number of Countries")
-plt.ylabel("Language")
-plt.tight_layout()
-plt.savefig("src/2026/20260113/cross_border_reach.png")
-
-# Plot 3: Linguistic Concentration
-plt.figure(figsize=(12, 6))
-sns.scatterplot(
-    data=country_concentration.to_pandas(),
-    x="lang_count",
-    y="speaker_variance",
-    hue="lang_count",
-    size="lang_count",
-    palette="viridis",
-    sizes=(50, 500),
-    legend=False,
-)
-plt.title(
-    "Linguistic Concentration: Diversity vs. Speaker Variance by Country", fontsize=14
-)
-plt.xlabel("Number of Languages Spoken")
-plt.ylabel("Variance in Native Speakers")
-plt.tight_layout()
-plt.savefig("src/2026/20260113/linguistic_concentration.png")
-
-# Diversity of Language Families per Country
-# We want to know how many distinct 'branches' of humanity are in one place.
-country_diversity = (
-    df.group_by("country")
-    .agg(
-        [
-            pl.col("family").n_unique().alias("family_diversity"),
-            pl.col("language").count().alias("total_languages"),
-        ]
+
+def render_density(density_df):
+    """Plot 1: Speaker Density per Family"""
+    # Missing families have no bar label, so skip them
+    density_df = density_df.drop_nulls("family")
+    density = density_df["speaker_density"].to_numpy()
+    cmap = sns.color_palette("flare", as_cmap=True)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.barh(density_df["family"].to_numpy(), density, color=cmap(Normalize()(density)))
+    ax.invert_yaxis()
+    ax.set_title(
+        "Speaker Density: Which Language Families have the most 'Impact' per Language?",
+        fontsize=14,
+    )
+    ax.set_xlabel("Average Native Speakers per Language")
+    ax.set_ylabel("Language Family")
+    fig.tight_layout()
+    fig.savefig("src/2026/20260113/speaker_density.png")
+    plt.close(fig)
+
+
+def render_reach(reach_df):
+    """Plot 2: Cross-border Reach"""
+    top_reach = reach_df.drop_nulls("language").head(10)
+    country_count = top_reach["country_count"].to_numpy()
+    cmap = sns.color_palette("crest", as_cmap=True)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.barh(
+        top_reach["language"].to_numpy(),
+        country_count,
+        color=cmap(Normalize()(country_count)),
     )
-    .sort("family_diversity", descending=True)
-)
-
-# Load Geographical Data, To be downloaded separately
-# You can get the original 'naturalearth_lowres' data from https://www.naturalearthdata.com/downloads/110m-cultural-vectors/.
-world = gpd.read_file("data/ne_110m_admin_0_countries.shp")
-africa = world[world["CONTINENT"] == "Africa"]
-
-# Join Polars Data with Map Data
-# We convert Polars to Pandas just for the merge with GeoPandas
-map_data = world.merge(
-    country_diversity.to_pandas(), left_on="ADMIN", right_on="country", how="left"
-)
-
-# 5. Plotting the Geographical Map
-fig, ax = plt.subplots(1, 1, figsize=(15, 10))
-# Plot missing data in light grey
-africa.plot(ax=ax, color="#eeeeee", edgecolor="#ffffff")
-# Plot the diversity index
-map_data.plot(
-    column="family_diversity",
-    ax=ax,
-    legend=True,
-    legend_kwds={
-        "label": "Number of Unique Language Families",
-        "orientation": "horizontal",
-    },
-    cmap="YlGnBu",
-    edgecolor="white",
-    linewidth=0.5,
-)
-ax.set_title(
-    "The African Linguistic Mosaic: Deep Family Diversity by Country", fontsize=20
-)
-ax.axis("off")
-plt.savefig("src/2026/20260113/output.png")
+    ax.invert_yaxis()
+    ax.set_title(
+        "Bridges of the Continent: Top 10 Languages Spoken in Multiple Countries",
+        fontsize=14,
+    )
+    ax.set_xlabel("Number of Countries")
+    ax.set_ylabel("Language")
+    fig.tight_layout()
+    fig.savefig("src/2026/20260113/cross_border_reach.png")
+    plt.close(fig)
+
+
+def render_concentration(country_concentration):
+    """Plot 3: Linguistic Concentration"""
+    lang_count = country_concentration["lang_count"].to_numpy()
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.scatter(
+        lang_count,
+        country_concentration["speaker_variance"].to_numpy(),
+        c=lang_count,
+        s=np.interp(lang_count, (lang_count.min(), lang_count.max()), (50, 500)),
+        cmap="viridis",
+        edgecolors="white",
+    )
+    ax.set_title(
+        "Linguistic Concentration: Diversity vs. Speaker Variance by Country",
+        fontsize=14,
+    )
+    ax.set_xlabel("Number of Languages Spoken")
+    ax.set_ylabel("Variance in Native Speakers")
+    fig.tight_layout()
+    fig.savefig("src/2026/20260113/linguistic_concentration.png")
+    plt.close(fig)
+
+
+def render_map(country_diversity):
+    """Plot 4: Language family diversity on the map of Africa"""
+    # Load Geographical Data, To be downloaded separately
+    # You can get the original 'naturalearth_lowres' data from https://www.naturalearthdata.com/downloads/110m-cultural-vectors/.
+    # Converted to GeoParquet on first run; only the columns used below are read back
+    world = read_cached_shapefile(
+        "data/ne_110m_admin_0_countries.shp",
+        "data/cache/ne_110m_admin_0_countries.parquet",
+        columns=["ADMIN", "CONTINENT", "geometry"],
+    )
+    africa = world[world["CONTINENT"] == "Africa"]
+
+    # Join Polars Data with Map Data
+    # We convert Polars to Arrow-backed Pandas just for the merge with GeoPandas,
+    # which shares the Arrow buffers instead of copying them into numpy
+    map_data = world.merge(
+        country_diversity.to_pandas(use_pyarrow_extension_array=True),
+        left_on="ADMIN",
+        right_on="country",
+        how="left",
+    )
+
+    # Plotting the Geographical Map
+    fig, ax = plt.subplots(1, 1, figsize=(15, 10))
+    # Plot missing data in light grey
+    africa.plot(ax=ax, color="#eeeeee", edgecolor="#ffffff")
+    # Plot the diversity index
+    map_data.plot(
+        column="family_diversity",
+        ax=ax,
+        legend=True,
+        legend_kwds={
+            "label": "Number of Unique Language Families",
+            "orientation": "horizontal",
+        },
+        cmap="YlGnBu",
+        edgecolor="white",
+        linewidth=0.5,
+    )
+    ax.set_title(
+        "The African Linguistic Mosaic: Deep Family Diversity by Country", fontsize=20
+    )
+    ax.axis("off")
+    fig.savefig("src/2026/20260113/output.png")
+    plt.close(fig)
+
+
+def main():
+    # Load data (cached locally as Parquet after the first run)
+    # Kept lazy so all aggregations below share a single scan
+    lf = scan_cached_csv(
+        "https://raw.githubusercontent.com/rfordatascience/tidytuesday/main/data/2026/2026-01-13/africa.csv",
+        "data/cache/africa.parquet",
+    ).select(["country", "language", "family", "native_speakers"])
+
+    density_df, reach_df, country_concentration, country_diversity = build_tables(lf)
+
+    render_density(density_df)
+    render_reach(reach_df)
+    render_concentration(country_concentration)
+    render_map(country_diversity)
+
+
+if __name__ == "__main__":
+    main()
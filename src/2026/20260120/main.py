@@ -1,5 +1,9 @@
+from pathlib import Path
+
+import numpy as np
 import polars as pl
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
 from pyfonts import load_font
 
 # =============================================================================
@@ -18,91 +22,52 @@ from pyfonts import load_font
 # - Color encodes subject specialty, not just decoration
 # =============================================================================
 
-# Load data
-df = pl.read_csv(
-    "https://raw.githubusercontent.com/rfordatascience/tidytuesday/main/data/2026/2026-01-20/apod.csv"
-)
-
-# Load fonts
-font_regular = load_font(
-    "https://github.com/google/fonts/raw/main/ofl/spacegrotesk/SpaceGrotesk%5Bwght%5D.ttf"
-)
-font_bold = load_font(
-    "https://github.com/google/fonts/raw/main/ofl/spacemono/SpaceMono-Bold.ttf"
-)
-
-
-# Classify subjects based on title
-def classify_subject(title):
-    title_lower = title.lower()
-    if any(x in title_lower for x in ["nebula", "nebulae"]):
-        return "Nebulae"
-    elif any(
-        x in title_lower
-        for x in ["galaxy", "galaxies", "andromeda", "m31", "m33", "m51", "m81", "m82"]
-    ):
-        return "Galaxies"
-    elif any(x in title_lower for x in ["milky way"]):
-        return "Milky Way"
-    elif any(x in title_lower for x in ["aurora", "northern light", "southern light"]):
-        return "Auroras"
-    elif any(x in title_lower for x in ["moon", "lunar"]):
-        return "Moon"
-    elif any(x in title_lower for x in ["eclipse"]):
-        return "Eclipses"
-    elif any(x in title_lower for x in ["comet"]):
-        return "Comets"
-    elif any(x in title_lower for x in ["sun", "solar", "sunspot"]):
-        return "Sun"
-    elif any(
-        x in title_lower for x in ["mars", "jupiter", "saturn", "venus", "planet"]
-    ):
-        return "Planets"
-    else:
-        return "Other"
-
-
-# Get top 10 photographers
-top_photogs = (
-    df.filter(~pl.col("copyright").is_in(["NA", ""]))
-    .group_by("copyright")
-    .agg(pl.len().alias("count"))
-    .sort("count", descending=True)
-    .head(10)
-)
-
-# Build data for stacked bars
-photographers = []
-subject_data = {
-    "Galaxies": [],
-    "Nebulae": [],
-    "Milky Way": [],
-    "Moon": [],
-    "Planets": [],
-    "Auroras": [],
-    "Comets": [],
-    "Sun": [],
-    "Eclipses": [],
-    "Other": [],
-}
 
-for row in top_photogs.iter_rows():
-    name, count = row
-    photographers.append(name)
-    photos = df.filter(pl.col("copyright") == name)
+def scan_cached_csv(url, cache_path):
+    """Download a remote CSV once as Parquet and scan the local copy afterwards."""
+    cache_path = Path(cache_path)
+    if not cache_path.exists():
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        pl.read_csv(url).write_parquet(cache_path)
+    return pl.scan_parquet(cache_path)
 
-    subject_counts = {}
-    for title in photos["title"].to_list():
-        subj = classify_subject(title)
-        subject_counts[subj] = subject_counts.get(subj, 0) + 1
 
-    for subj in subject_data.keys():
-        subject_data[subj].append(subject_counts.get(subj, 0))
+# Order subjects by total contribution for better visual hierarchy
+subject_order = [
+    "Galaxies",
+    "Nebulae",
+    "Milky Way",
+    "Moon",
+    "Planets",
+    "Auroras",
+    "Comets",
+    "Sun",
+    "Eclipses",
+    "Other",
+]
 
-# Reverse for bottom-to-top plotting (highest at top)
-photographers = photographers[::-1]
-for subj in subject_data:
-    subject_data[subj] = subject_data[subj][::-1]
+# Title keywords per subject, matched as literal substrings
+# Checked in this order, so the first matching subject wins
+subject_keywords = {
+    "Nebulae": ["nebula", "nebulae"],
+    "Galaxies": ["galaxy", "galaxies", "andromeda", "m31", "m33", "m51", "m81", "m82"],
+    "Milky Way": ["milky way"],
+    "Auroras": ["aurora", "northern light", "southern light"],
+    "Moon": ["moon", "lunar"],
+    "Eclipses": ["eclipse"],
+    "Comets": ["comet"],
+    "Sun": ["sun", "solar", "sunspot"],
+    "Planets": ["mars", "jupiter", "saturn", "venus", "planet"],
+}
+
+# Classify subjects based on the lowercased title (the "title_lc" column)
+subject = pl.coalesce(
+    [
+        pl.when(pl.col("title_lc").str.contains_any(keywords)).then(pl.lit(subj))
+        for subj, keywords in subject_keywords.items()
+    ]
+    + [pl.lit("Other")]
+).alias("subject")
 
 # Colors - vibrant cosmic palette with better contrast
 colors = {
@@ -118,227 +83,281 @@ colors = {
     "Other": "#4A4A4A",  # Darker gray (unclassified)
 }
 
-# Create figure
-fig, ax = plt.subplots(figsize=(12, 8), facecolor="#0B1E38")
-ax.set_facecolor("#0B1E38")
 
-# Plot stacked horizontal bars
-y_pos = range(len(photographers))
-left = [0] * len(photographers)
+def build_subject_counts(lf):
+    """Count each top-10 photographer's images per subject, bottom bar first."""
+    # Get top 10 photographers
+    # Ties are broken by name so both queries below agree on the same ten
+    top_photogs = (
+        lf.group_by("copyright")
+        .agg(pl.len().alias("count"))
+        .top_k(10, by=["count", "copyright"], reverse=[False, True])
+        .sort(["count", "copyright"], descending=[True, False])
+    )
 
-# Order subjects by total contribution for better visual hierarchy
-subject_order = [
-    "Galaxies",
-    "Nebulae",
-    "Milky Way",
-    "Moon",
-    "Planets",
-    "Auroras",
-    "Comets",
-    "Sun",
-    "Eclipses",
-    "Other",
-]
+    # Build data for stacked bars: one row per photographer, one column per subject
+    subject_counts = (
+        lf.join(top_photogs.select("copyright"), on="copyright")
+        .with_columns(title_lc=pl.col("title").str.to_lowercase())
+        .with_columns(subject)
+        .group_by(["copyright", "subject"])
+        .agg(pl.len())
+    )
+    top_photogs, subject_counts = pl.collect_all([top_photogs, subject_counts])
+    subject_counts = subject_counts.pivot(
+        on="subject", index="copyright", values="len"
+    ).fill_null(0)
+    subject_counts = top_photogs.select("copyright").join(
+        subject_counts, on="copyright", how="left", maintain_order="left"
+    )
+    # Subjects none of the top photographers shot still need a (zero) column
+    subject_counts = subject_counts.with_columns(
+        [
+            pl.lit(0, dtype=pl.UInt32).alias(subj)
+            for subj in subject_order
+            if subj not in subject_counts.columns
+        ]
+    )
+
+    # Reverse for bottom-to-top plotting (highest at top)
+    photographers = subject_counts["copyright"].to_list()[::-1]
+    # Shape (n_subjects, n_photographers)
+    arr = subject_counts.select(subject_order).to_numpy().T[:, ::-1]
+
+    return photographers, arr
+
+
+def render(photographers, arr, font_regular, font_bold):
+    """Draw the stacked subject bars and save the figure."""
+    # Running offsets for stacking
+    cum = np.vstack([np.zeros(arr.shape[1], dtype=arr.dtype), np.cumsum(arr, axis=0)])
+    subj_idx = {subj: i for i, subj in enumerate(subject_order)}
+
+    # Create figure
+    fig, ax = plt.subplots(figsize=(12, 8), facecolor="#0B1E38")
+    ax.set_facecolor("#0B1E38")
+
+    # Plot stacked horizontal bars
+    y_pos = np.arange(len(photographers))
+    has_data = arr.sum(axis=1) > 0
+    # RGBA per subject row, so bars are colored by index rather than by name
+    color_arr = np.array([to_rgba(colors[subj]) for subj in subject_order])
+
+    for i, subj in enumerate(subject_order):
+        ax.barh(
+            y_pos,
+            arr[i],
+            left=cum[i],
+            color=color_arr[i],
+            label=subj if has_data[i] else None,
+            height=0.7,
+            edgecolor="#0B1E38",
+            linewidth=0.5,
+        )
+
+    # Add photographer names and annotations
+    for i, (name, total) in enumerate(zip(photographers, cum[-1])):
+        # Name on the left (outside plot area)
+        ax.text(
+            -2,
+            i,
+            name,
+            ha="right",
+            va="center",
+            color="#E8E8E8",
+            fontproperties=font_regular,
+            fontsize=12,
+        )
+        # Total count at the end of bar
+        ax.text(
+            total + 1.5,
+            i,
+            str(total),
+            ha="left",
+            va="center",
+            color="#888888",
+            fontproperties=font_regular,
+            fontsize=10,
+        )
+
+    # Add direct annotations on bars for main subjects (where segments are large enough)
+    bar_centers = cum[:-1] + arr / 2
+    segment_labels = [subj.replace(" ", "\n") for subj in subject_order]
+    # Determine text color for contrast, lighter gray for "Other"
+    text_colors = [
+        "#CCCCCC"
+        if subj == "Other"
+        else "#FFFFFF"
+        if subj in ["Nebulae", "Comets"]
+        else "#000000"
+        for subj in subject_order
+    ]
+    # Only label segments with 5+ images
+    for s, i in zip(*np.where(arr >= 5)):
+        ax.text(
+            bar_centers[s, i],
+            i,
+            segment_labels[s],
+            ha="center",
+            va="center",
+            color=text_colors[s],
+            fontproperties=font_regular,
+            fontsize=9.5,
+            fontweight="bold",
+        )
 
-for subj in subject_order:
-    values = subject_data[subj]
-    bars = ax.barh(
-        y_pos,
-        values,
-        left=left,
-        color=colors[subj],
-        label=subj if sum(values) > 0 else None,
-        height=0.7,
-        edgecolor="#0B1E38",
-        linewidth=0.5,
+    # Add strategic annotations for specific unlabeled small segments
+    # Annotate a few key examples to identify colors without labels
+
+    # Comets annotation (purple) - on Martin Pugh's or Adam Block's bar
+    martin_idx = photographers.index("Martin Pugh")
+    comet_center = (
+        cum[subj_idx["Comets"], martin_idx] + arr[subj_idx["Comets"], martin_idx] / 2
+    )
+    ax.annotate(
+        "Comets",
+        xy=(comet_center, martin_idx),
+        xytext=(comet_center + 2, martin_idx + 0.5),
+        ha="left",
+        color="#C77DFF",
+        fontproperties=font_regular,
+        fontsize=7.5,
+        arrowprops=dict(arrowstyle="-", color="#C77DFF", lw=0.8),
+    )
+
+    # Sun annotation (orange/amber) - on Babak Tafreshi's bar
+    babak_idx = photographers.index("Babak Tafreshi")
+    sun_center = cum[subj_idx["Sun"], babak_idx] + arr[subj_idx["Sun"], babak_idx] / 2
+    ax.annotate(
+        "Sun",
+        xy=(sun_center, babak_idx),
+        xytext=(sun_center, babak_idx),
+        ha="center",
+        va="center",
+        color="black",
+        fontproperties=font_regular,
+        fontsize=7.5,
+    )
+
+    # Eclipse annotation (medium gray) - on Tunç Tezel's bar
+    tunc_idx = photographers.index("Tunç Tezel")
+    eclipse_center = (
+        cum[subj_idx["Eclipses"], tunc_idx] + arr[subj_idx["Eclipses"], tunc_idx] / 2
+    )
+    ax.annotate(
+        "Eclipse",
+        xy=(eclipse_center, tunc_idx - 0.15),
+        xytext=(eclipse_center + 5, tunc_idx - 0.55),
+        ha="center",
+        color="#8B8B8B",
+        fontproperties=font_regular,
+        fontsize=7.5,
+        arrowprops=dict(arrowstyle="-", color="white", lw=0.8),
     )
-    left = [l + v for l, v in zip(left, values)]
 
-# Add photographer names and annotations
-for i, (name, total) in enumerate(zip(photographers, left)):
-    # Name on the left (outside plot area)
+    # Clean up axes - maximize data-to-ink ratio
+    ax.set_yticks([])
+    ax.set_xlim(-8, 70)  # Start closer to 0 with space for names
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.spines["left"].set_visible(False)
+    ax.spines["bottom"].set_color("#333333")
+    ax.tick_params(axis="x", colors="#666666", labelsize=9)
+    ax.set_xlabel(
+        "Total number of photographs featured in APOD",
+        color="#888888",
+        fontproperties=font_regular,
+        fontsize=10,
+        fontweight="bold",
+    )
+
+    # Add subtle note about "Other" category
     ax.text(
-        -2,
-        i,
-        name,
+        0.5,
+        -0.08,
+        '"Other" includes subjects not classified into main categories (e.g., unique phenomena, Earth features, spacecraft)',
+        transform=ax.transAxes,
+        ha="center",
+        va="top",
+        color="#666666",
+        fontproperties=font_regular,
+        fontsize=9,
+        style="italic",
+    )
+
+    # Add subtle note about "Other" category
+    ax.text(
+        1,
+        -0.08,
+        "Made by MFM | Data: NASA APOD via TidyTuesday",
+        transform=ax.transAxes,
         ha="right",
-        va="center",
-        color="#E8E8E8",
+        va="top",
+        color="#fefae0",
         fontproperties=font_regular,
-        fontsize=12,
+        fontsize=9,
+        style="italic",
     )
-    # Total count at the end of bar
+
+    # Title
     ax.text(
-        total + 1.5,
-        i,
-        str(total),
-        ha="left",
-        va="center",
+        0.5,
+        1.1,
+        "The Guardians of the Night Sky",
+        transform=ax.transAxes,
+        ha="center",
+        va="bottom",
+        color="#E8E8E8",
+        fontproperties=font_bold,
+        fontsize=27,
+    )
+    ax.text(
+        0.5,
+        1.03,
+        "Top 10 astrophotographers by total number of images featured in NASA's APOD (2007-2025)",
+        transform=ax.transAxes,
+        ha="center",
+        va="bottom",
         color="#888888",
         fontproperties=font_regular,
-        fontsize=10,
+        fontsize=15,
     )
 
-# Add direct annotations on bars for main subjects (where segments are large enough)
-cumulative_left = [0] * len(photographers)
-for subj in subject_order:
-    values = subject_data[subj]
-    for i, value in enumerate(values):
-        if value >= 5:  # Only label segments with 5+ images
-            bar_center = cumulative_left[i] + value / 2
-            # Determine text color for contrast
-            text_color = "#FFFFFF" if subj in ["Nebulae", "Comets"] else "#000000"
-            text_color = (
-                "#CCCCCC" if subj == "Other" else text_color
-            )  # Lighter gray for "Other"
-            ax.text(
-                bar_center,
-                i,
-                subj.replace(" ", "\n") if " " in subj else subj,
-                ha="center",
-                va="center",
-                color=text_color,
-                fontproperties=font_regular,
-                fontsize=9.5,
-                fontweight="bold",
-            )
-        cumulative_left[i] += value
-
-# Add strategic annotations for specific unlabeled small segments
-# Annotate a few key examples to identify colors without labels
-
-# Comets annotation (purple) - on Martin Pugh's or Adam Block's bar
-martin_idx = photographers.index("Martin Pugh")
-offset = sum(
-    [
-        subject_data[s][martin_idx]
-        for s in subject_order[: subject_order.index("Comets")]
-    ]
-)
-comet_center = offset + subject_data["Comets"][martin_idx] / 2
-ax.annotate(
-    "Comets",
-    xy=(comet_center, martin_idx),
-    xytext=(comet_center + 2, martin_idx + 0.5),
-    ha="left",
-    color="#C77DFF",
-    fontproperties=font_regular,
-    fontsize=7.5,
-    arrowprops=dict(arrowstyle="-", color="#C77DFF", lw=0.8),
-)
-
-# Sun annotation (orange/amber) - on Babak Tafreshi's bar
-babak_idx = photographers.index("Babak Tafreshi")
-offset = sum(
-    [subject_data[s][babak_idx] for s in subject_order[: subject_order.index("Sun")]]
-)
-sun_center = offset + subject_data["Sun"][babak_idx] / 2
-ax.annotate(
-    "Sun",
-    xy=(sun_center, babak_idx),
-    xytext=(sun_center, babak_idx),
-    ha="center",
-    va="center",
-    color="black",
-    fontproperties=font_regular,
-    fontsize=7.5,
-)
-
-# Eclipse annotation (medium gray) - on Tunç Tezel's bar
-tunc_idx = photographers.index("Tunç Tezel")
-offset = sum(
-    [
-        subject_data[s][tunc_idx]
-        for s in subject_order[: subject_order.index("Eclipses")]
-    ]
-)
-eclipse_center = offset + subject_data["Eclipses"][tunc_idx] / 2
-ax.annotate(
-    "Eclipse",
-    xy=(eclipse_center, tunc_idx - 0.15),
-    xytext=(eclipse_center + 5, tunc_idx - 0.55),
-    ha="center",
-    color="#8B8B8B",
-    fontproperties=font_regular,
-    fontsize=7.5,
-    arrowprops=dict(arrowstyle="-", color="white", lw=0.8),
-)
-
-# Clean up axes - maximize data-to-ink ratio
-ax.set_yticks([])
-ax.set_xlim(-8, 70)  # Start closer to 0 with space for names
-ax.spines["top"].set_visible(False)
-ax.spines["right"].set_visible(False)
-ax.spines["left"].set_visible(False)
-ax.spines["bottom"].set_color("#333333")
-ax.tick_params(axis="x", colors="#666666", labelsize=9)
-ax.set_xlabel(
-    "Total number of photographs featured in APOD",
-    color="#888888",
-    fontproperties=font_regular,
-    fontsize=10,
-    fontweight="bold",
-)
-
-# Add subtle note about "Other" category
-ax.text(
-    0.5,
-    -0.08,
-    '"Other" includes subjects not classified into main categories (e.g., unique phenomena, Earth features, spacecraft)',
-    transform=ax.transAxes,
-    ha="center",
-    va="top",
-    color="#666666",
-    fontproperties=font_regular,
-    fontsize=9,
-    style="italic",
-)
-
-# Add subtle note about "Other" category
-ax.text(
-    1,
-    -0.08,
-    "Made by MFM | Data: NASA APOD via TidyTuesday",
-    transform=ax.transAxes,
-    ha="right",
-    va="top",
-    color="#fefae0",
-    fontproperties=font_regular,
-    fontsize=9,
-    style="italic",
-)
-
-# Title
-ax.text(
-    0.5,
-    1.1,
-    "The Guardians of the Night Sky",
-    transform=ax.transAxes,
-    ha="center",
-    va="bottom",
-    color="#E8E8E8",
-    fontproperties=font_bold,
-    fontsize=27,
-)
-ax.text(
-    0.5,
-    1.03,
-    "Top 10 astrophotographers by total number of images featured in NASA's APOD (2007-2025)",
-    transform=ax.transAxes,
-    ha="center",
-    va="bottom",
-    color="#888888",
-    fontproperties=font_regular,
-    fontsize=15,
-)
-
-plt.tight_layout()
-plt.subplots_adjust(bottom=0.12, top=0.88)
-plt.savefig(
-    "src/2026/20260120/output.png",
-    dpi=150,
-    facecolor="#0B1E38",
-    bbox_inches="tight",
-    pad_inches=0.3,
-)
-plt.close()
+    plt.tight_layout()
+    plt.subplots_adjust(bottom=0.12, top=0.88)
+    plt.savefig(
+        "src/2026/20260120/output.png",
+        dpi=150,
+        facecolor="#0B1E38",
+        bbox_inches="tight",
+        pad_inches=0.3,
+    )
+    plt.close(fig)
+
+
+def main():
+    # Load data (cached locally as Parquet after the first run)
+    # Kept lazy so the column selection and the credit filter are pushed into the scan
+    lf = (
+        scan_cached_csv(
+            "https://raw.githubusercontent.com/rfordatascience/tidytuesday/main/data/2026/2026-01-20/apod.csv",
+            "data/cache/apod.parquet",
+        )
+        .select(["copyright", "title"])
+        .filter(~pl.col("copyright").is_in(["NA", ""]))
+    )
+
+    # Load fonts
+    font_regular = load_font(
+        "https://github.com/google/fonts/raw/main/ofl/spacegrotesk/SpaceGrotesk%5Bwght%5D.ttf"
+    )
+    font_bold = load_font(
+        "https://github.com/google/fonts/raw/main/ofl/spacemono/SpaceMono-Bold.ttf"
+    )
+
+    photographers, arr = build_subject_counts(lf)
+    render(photographers, arr, font_regular, font_bold)
+
+
+if __name__ == "__main__":
+    main()